@@ -16,30 +16,58 @@ The tone follows the lively DejiRyu character inspired by Ryuukuru.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import random
-from collections import defaultdict
-from dataclasses import dataclass
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 import discord
+import jsonschema
+import orjson
 from discord import Intents, Message
 from discord.ext import commands, tasks
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
 LOGGER = logging.getLogger('dejiryu')
+CONFIG_SCHEMA_PATH = Path(__file__).with_name('config.schema.json')
+EVENT_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+EVENT_TIME_RE = re.compile(r'\d{2}:\d{2}')
+
+# Display names used when a configured channel cannot be resolved.
+CHANNEL_LABELS: Dict[str, str] = {
+    'self_intro': '#😍自己紹介',
+    'ai_news': '#📝最新情報',
+    'interaction': '#交流会',
+    'exclusive': '#限定コンテンツ',
+    'events': '#イベント情報',
+    'achievements': '#できたを報告する部屋',
+    'consultation': '#相談部屋',
+}
 
 
 def load_json(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f'Config not found: {path}')
-    return json.loads(path.read_text(encoding='utf-8'))
+    return orjson.loads(path.read_bytes())
+
+
+def validate_config(data: Dict[str, Any]) -> None:
+    '''Check the raw config against config.schema.json, reporting every problem at once.'''
+    validator = jsonschema.Draft202012Validator(load_json(CONFIG_SCHEMA_PATH))
+    errors = sorted(validator.iter_errors(data), key=lambda error: list(error.absolute_path))
+    if errors:
+        details = '; '.join(
+            f'{"/".join(str(part) for part in error.absolute_path) or "<root>"}: {error.message}'
+            for error in errors
+        )
+        raise ValueError(f'Invalid config: {details}')
 
 
 @dataclass
@@ -49,17 +77,28 @@ class ExclusiveContentItem:
     url: Optional[str] = None
 
 
+@dataclass
+class ParsedEvent:
+    '''In-memory view of a stored event with its timestamps already parsed.'''
+
+    payload: Dict[str, Any]
+    event_time: datetime
+    reminders: List[Tuple[str, datetime]]
+    reminded: Set[str]
+
+
 @dataclass
 class ConsultationPrompt:
     ping_role_id: Optional[int]
     message_variations: List[str]
+    # Rotation order for consultation_ping; cycling it avoids back-to-back repeats.
+    shuffled: List[str] = field(default_factory=list)
 
 
 class Config:
-    def __init__(self, data: Dict[str, Any]) -> None:
-        if 'channels' not in data:
-            raise KeyError('channels section is required in the config file')
+    '''Typed view over a config dict that has already passed validate_config.'''
 
+    def __init__(self, data: Dict[str, Any]) -> None:
         self.discord_token_env: str = data.get('discord_token_env', 'DISCORD_BOT_TOKEN')
         self.guild_id: Optional[int] = int(data['guild_id']) if data.get('guild_id') else None
         self.tz: ZoneInfo = ZoneInfo(data.get('timezone', 'Asia/Tokyo'))
@@ -95,39 +134,42 @@ class Config:
                 ],
             ),
         )
+        variations = self.consultation_prompt.message_variations
+        # Seed from the variations themselves so the order survives restarts and
+        # the persisted consultation_msg_idx keeps pointing into the same cycle.
+        rng = random.Random('\n'.join(variations))
+        self.consultation_prompt.shuffled = rng.sample(variations, len(variations))
 
-        self._validate()
-
-    def _validate(self) -> None:
-        required_channels = {
-            'self_intro',
-            'ai_news',
-            'events',
-            'achievements',
-            'consultation',
-        }
-        missing = required_channels - self.channels.keys()
-        if missing:
-            raise ValueError(f'Missing channels in config: {", ".join(sorted(missing))}')
-
-        if self.exclusive_rotation_days < 1:
-            raise ValueError('exclusive_content.content_rotation_days must be >= 1')
 
-        if not self.consultation_prompt.message_variations:
-            raise ValueError('At least one consultation message variation is required.')
+class StateManager:
+    '''
+    JSON-backed state store so schedules survive restarts.
 
+    Every mutation is appended to a write-ahead log next to the snapshot
+    (``state.log``); :meth:`compact` folds the log back into ``state.json``.
+    '''
 
-class StateManager:
-    '''JSON-backed state store so schedules survive restarts.'''
+    COMPACT_EVERY_ENTRIES = 500
+    # Shared by log lines and snapshots so both accept the same values.
+    JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    DEBOUNCE_SECONDS = 1.0
 
     def __init__(self, path: Path) -> None:
         self._path = path
+        self._wal_path = path.with_suffix('.log')
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = asyncio.Lock()
+        self._locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Serializes log appends and compaction, independent of the per-key locks.
+        self._flush_lock = asyncio.Lock()
+        self._wal_entries = 0
+        self._dirty_keys: Set[str] = set()
+        self._dirty = asyncio.Event()
+        self._closing = asyncio.Event()
         self._data: Dict[str, Any] = {
             'reaction_counts': {},
             'achievement_logs': {},
             'exclusive_rotation_index': 0,
+            'consultation_msg_idx': 0,
             'events': [],
             'last_consultation_ping': None,
             'last_self_intro_digest': None,
@@ -135,35 +177,190 @@ class StateManager:
         }
         if path.exists():
             try:
-                self._data.update(json.loads(path.read_text(encoding='utf-8')))
-            except json.JSONDecodeError:
-                LOGGER.warning('State file is corrupted. Recreating default state.')
+                self._data.update(orjson.loads(path.read_bytes()))
+            except orjson.JSONDecodeError:
+                corrupt_path = path.with_suffix(path.suffix + '.corrupt')
+                os.replace(path, corrupt_path)
+                LOGGER.warning('State file is corrupted. Moved it to %s and recreated default state.', corrupt_path)
+        self._replay_wal()
+        self._wal = self._wal_path.open('ab')
+        self._writer = asyncio.create_task(self._writer_loop())
 
     async def update(self, key: str, value: Any) -> None:
-        async with self._lock:
+        async with self._locks[key]:
             self._data[key] = value
-            self._flush()
+            self._mark_dirty(key)
 
     async def mutate(self, key: str, mutate_fn: Callable[[Any], Any]) -> Any:
-        async with self._lock:
+        async with self._locks[key]:
             current = self._data.get(key)
             new_value = mutate_fn(current)
             self._data[key] = new_value
-            self._flush()
+            self._mark_dirty(key)
             return new_value
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._data.get(key, default)
 
-    def _flush(self) -> None:
-        self._path.write_text(
-            json.dumps(self._data, ensure_ascii=False, indent=2),
-            encoding='utf-8',
+    async def flush_now(self) -> None:
+        '''Write pending mutations to the log without waiting for the debounce.'''
+        async with self._flush_lock:
+            if self._wal.closed:
+                return
+            await self._flush()
+
+    async def compact(self) -> None:
+        '''Rewrite the snapshot from memory and truncate the write-ahead log.'''
+        async with self._flush_lock:
+            if self._wal.closed:
+                return
+            await self._compact()
+
+    async def close(self) -> None:
+        # Let the writer finish its current write and exit rather than
+        # cancelling it mid-append.
+        self._closing.set()
+        self._dirty.set()
+        await self._writer
+        async with self._flush_lock:
+            if self._wal.closed:
+                return
+            await self._compact()
+            os.fsync(self._wal.fileno())
+            self._wal.close()
+
+    def _mark_dirty(self, key: str) -> None:
+        self._dirty_keys.add(key)
+        self._dirty.set()
+
+    async def _writer_loop(self) -> None:
+        # Bursts of mutations (e.g. a flurry of reactions) collapse into a
+        # single log write per key once the debounce window has passed.
+        while not self._closing.is_set():
+            await self._dirty.wait()
+            self._dirty.clear()
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.DEBOUNCE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush_now()
+            except Exception:
+                # Keep the writer alive; the keys stay in memory for the next compaction.
+                LOGGER.exception('Failed to write the state log.')
+
+    def _replay_wal(self) -> None:
+        if not self._wal_path.exists():
+            return
+        good_offset = 0
+        with self._wal_path.open('rb') as wal:
+            for line in wal:
+                entry = None
+                # A line without its newline is an append cut short by a crash.
+                if line.endswith(b'\n'):
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        pass
+                if not isinstance(entry, dict):
+                    LOGGER.warning('State log has a torn entry. Truncating the log at byte %d.', good_offset)
+                    break
+                self._data[entry['k']] = entry['v']
+                self._wal_entries += 1
+                good_offset += len(line)
+            else:
+                return
+        # Cut the torn tail off so the next append starts on a clean line.
+        os.truncate(self._wal_path, good_offset)
+
+    async def _flush(self) -> None:
+        if not self._dirty_keys:
+            return
+        await self._run_io(self._append_wal, self._encode_dirty())
+        if self._wal_entries >= self.COMPACT_EVERY_ENTRIES:
+            await self._compact()
+
+    async def _compact(self) -> None:
+        if not self._dirty_keys and self._wal_entries == 0 and self._path.exists():
+            return
+        # Pending keys are logged from the same in-memory values as the
+        # snapshot, so the last log entry for every key matches the snapshot.
+        pending = self._encode_dirty()
+        snapshot = orjson.dumps(self._data, option=self.JSON_OPTIONS | orjson.OPT_INDENT_2)
+        await self._run_io(self._write_snapshot, pending, snapshot)
+        self._wal_entries = 0
+
+    def _encode_dirty(self) -> bytes:
+        # Encode on the loop thread: callers may still hold references into
+        # ``_data`` and mutate them while a worker thread would be reading.
+        lines = b''.join(
+            orjson.dumps({'k': key, 'v': self._data[key]}, option=self.JSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            for key in self._dirty_keys
         )
+        self._wal_entries += len(self._dirty_keys)
+        self._dirty_keys.clear()
+        return lines
+
+    async def _run_io(self, fn: Callable[..., None], *args: Any) -> None:
+        # Cancelling a caller must not release _flush_lock while the worker
+        # thread is still touching the log, so wait the write out first.
+        io_task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        try:
+            await asyncio.shield(io_task)
+        except asyncio.CancelledError:
+            await io_task
+            raise
+
+    def _append_wal(self, lines: bytes) -> None:
+        self._wal.write(lines)
+        self._wal.flush()
+
+    def _write_snapshot(self, pending: bytes, snapshot: bytes) -> None:
+        if pending:
+            self._append_wal(pending)
+        tmp_path = self._path.with_suffix(self._path.suffix + '.tmp')
+        with tmp_path.open('wb') as tmp:
+            tmp.write(snapshot)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, self._path)
+        if os.name == 'posix':
+            # Persist the rename itself, not just the file contents.
+            dir_fd = os.open(self._path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        # Only truncate once the snapshot is in place. If we crash before the
+        # truncate, replaying the log is a no-op: each key's last entry was
+        # encoded together with the snapshot and holds the same full value.
+        self._wal.truncate(0)
+        self._wal.seek(0)
 
 
 def iso_week_key(dt: datetime) -> str:
-    return f'{dt.isocalendar().year}-W{dt.isocalendar().week:02d}'
+    iso = dt.isocalendar()
+    return f'{iso.year}-W{iso.week:02d}'
+
+
+def parse_event_datetime(date: str, time_: str) -> datetime:
+    '''Parse naive ``!event`` arguments, trying the fast ISO parser before strptime.'''
+    # fromisoformat also accepts offsets, week dates and seconds; only hand it
+    # the exact YYYY-MM-DD / HH:MM shape so the accepted input stays the same.
+    if EVENT_DATE_RE.fullmatch(date) and EVENT_TIME_RE.fullmatch(time_):
+        return datetime.fromisoformat(f'{date}T{time_}')
+    # strptime still accepts non zero-padded input such as 2025-3-9 9:30.
+    return datetime.strptime(f'{date} {time_}', '%Y-%m-%d %H:%M')
+
+
+def prune_old_weeks(weekly: Dict[str, Any], now: datetime, keep: int = 8) -> int:
+    '''Drop ISO-week buckets older than ``keep`` weeks before ``now``; returns how many were removed.'''
+    # Week keys are zero-padded, so string order matches chronological order.
+    cutoff = iso_week_key(now - timedelta(weeks=keep))
+    stale = [week_key for week_key in weekly if week_key < cutoff]
+    for week_key in stale:
+        del weekly[week_key]
+    return len(stale)
 
 
 def next_run_at(hour: int, minute: int, tz: ZoneInfo) -> datetime:
@@ -174,12 +371,12 @@ def next_run_at(hour: int, minute: int, tz: ZoneInfo) -> datetime:
     return candidate
 
 
-def mention_user(bot: commands.Bot, user_id: int) -> str:
-    user = bot.get_user(user_id)
-    return user.mention if user else f'<@{user_id}>'
-
-
 class DejiRyuBot(commands.Bot):
+    # Upper bound on concurrent REST fetches so reports stay inside rate limits.
+    FETCH_CONCURRENCY = 5
+    # Ceiling on messages scanned for a digest; a few days of intros fit well within it.
+    MAX_DIGEST_MESSAGES = 500
+
     def __init__(self, config: Config, state: StateManager) -> None:
         intents = Intents.default()
         intents.message_content = True
@@ -191,20 +388,59 @@ class DejiRyuBot(commands.Bot):
         self.config = config
         self.state = state
         self.http_session: Optional[aiohttp.ClientSession] = None
+        # Rebuilt lazily from state on the first reminder tick after startup.
+        self._event_cache: Optional[Dict[int, ParsedEvent]] = None
+        # Reaction tallies live in memory and are snapshotted to state on a timer.
+        self._reaction_counts: DefaultDict[str, Counter[str]] = defaultdict(Counter)
+        self._reaction_counts_dirty = False
+        self._channel_cache: Dict[str, discord.TextChannel] = {}
 
         self.add_command(self.schedule_event)
 
     async def setup_hook(self) -> None:
-        self.http_session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        self.http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=15, connect=5),
+        )
+        for week_key, week_counts in self.state.get('reaction_counts', {}).items():
+            self._reaction_counts[week_key] = Counter(week_counts)
 
     async def close(self) -> None:
+        # Disconnect first so no more events arrive, then stop every task loop
+        # so nothing mutates state after the final snapshot below.
+        await super().close()
+        for loop in (
+            self.self_intro_digest,
+            self.ai_news_task,
+            self.interaction_report,
+            self.exclusive_drop,
+            self.achievement_report,
+            self.consultation_ping,
+            self.event_reminder,
+            self.compact_state,
+            self.snapshot_reaction_counts,
+        ):
+            loop_task = loop.get_task()
+            loop.cancel()
+            if loop_task is not None:
+                await asyncio.gather(loop_task, return_exceptions=True)
         if self.http_session:
             await self.http_session.close()
-        await super().close()
+        await self._snapshot_reaction_counts()
+        await self.state.flush_now()
+        await self.state.close()
 
     # -------------------------------------------------------------- Events --
     async def on_ready(self) -> None:
         LOGGER.info('DejiRyu online as %s', self.user)
+        self._channel_cache.clear()
         if not self.self_intro_digest.is_running():
             self.self_intro_digest.start()
         if not self.ai_news_task.is_running():
@@ -219,6 +455,15 @@ class DejiRyuBot(commands.Bot):
             self.consultation_ping.start()
         if not self.event_reminder.is_running():
             self.event_reminder.start()
+        if not self.compact_state.is_running():
+            self.compact_state.start()
+        if not self.snapshot_reaction_counts.is_running():
+            self.snapshot_reaction_counts.start()
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        for key, cached in list(self._channel_cache.items()):
+            if cached.id == channel.id:
+                del self._channel_cache[key]
 
     async def on_message(self, message: Message) -> None:
         if message.author.bot:
@@ -248,24 +493,19 @@ class DejiRyuBot(commands.Bot):
         if payload.channel_id != interaction_channel_id:
             return
 
-        tz = self.config.tz
-        week_key = iso_week_key(datetime.now(tz))
-
-        async def mutate(counts: Optional[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
-            counts = counts or {}
-            week_counts = counts.get(week_key, {})
-            user_key = str(payload.user_id)
-            week_counts[user_key] = max(0, week_counts.get(user_key, 0) + delta)
-            counts[week_key] = week_counts
-            return counts
+        now = datetime.now(self.config.tz)
+        week_key = iso_week_key(now)
 
-        await self.state.mutate('reaction_counts', mutate)
+        counts = self._reaction_counts[week_key]
+        user_key = str(payload.user_id)
+        counts[user_key] = max(0, counts[user_key] + delta)
+        self._reaction_counts_dirty = True
 
     async def _record_achievement(self, message: Message) -> None:
-        tz = self.config.tz
-        week_key = iso_week_key(datetime.now(tz))
+        now = datetime.now(self.config.tz)
+        week_key = iso_week_key(now)
 
-        async def mutate(logs: Optional[Dict[str, List[int]]]) -> Dict[str, List[int]]:
+        def mutate(logs: Optional[Dict[str, List[int]]]) -> Dict[str, List[int]]:
             logs = logs or {}
             week_logs = logs.get(week_key, [])
             week_logs.append(message.id)
@@ -285,7 +525,7 @@ class DejiRyuBot(commands.Bot):
         '''
         tz = self.config.tz
         try:
-            event_datetime = datetime.strptime(f'{date} {time_}', '%Y-%m-%d %H:%M')
+            event_datetime = parse_event_datetime(date, time_)
         except ValueError:
             await ctx.reply('日付は YYYY-MM-DD HH:MM 形式で頼むぞ！例: `!event 2025-03-10 19:30 春のキックオフ会`')
             return
@@ -306,20 +546,21 @@ class DejiRyuBot(commands.Bot):
             'reminded': [],
         }
 
-        async def mutate(events: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        def mutate(events: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
             events = events or []
             events.append(event_payload)
             return events
 
         await self.state.mutate('events', mutate)
+        if self._event_cache is not None:
+            self._event_cache[event_payload['message_id']] = self._parse_event(event_payload)
         await ctx.reply(f'了解だぞ！イベント「{title}」の予定をキャッチした。3日前・1日前・6時間前にデジリューが吠えるから覚悟しててくれ！')
 
     # ---------------------------------------------------------- Schedules --
     @tasks.loop(hours=96)
     async def self_intro_digest(self) -> None:
-        channel = self.get_channel(self.config.channels['self_intro'])
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#😍自己紹介 channel not found or invalid.')
+        channel = self._text_channel('self_intro')
+        if channel is None:
             return
 
         tz = self.config.tz
@@ -342,10 +583,9 @@ class DejiRyuBot(commands.Bot):
             ]
             for user_id, msgs in grouped.items():
                 latest = max(msgs, key=lambda m: m.created_at)
-                intro_excerpt = latest.content[:160].replace('\n', ' ')
-                if len(latest.content) > 160:
-                    intro_excerpt += '…'
-                lines.append(f'- {mention_user(self, user_id)} さん：{intro_excerpt or "自己紹介をしてくれたぞ！"}')
+                content = latest.content
+                intro_excerpt = (content[:160] + '…' if len(content) > 160 else content).replace('\n', ' ')
+                lines.append(f'- {self.mention_user(user_id)} さん：{intro_excerpt or "自己紹介をしてくれたぞ！"}')
             lines.append('')
             lines.append('仲良くなるチャンスを逃すなよ！気になった子にはスレッドで声をかけてみてくれ！')
             summary = '\n'.join(lines)
@@ -356,15 +596,12 @@ class DejiRyuBot(commands.Bot):
     @self_intro_digest.before_loop
     async def before_self_intro_digest(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(15, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(15, 0)
 
     @tasks.loop(hours=24)
     async def ai_news_task(self) -> None:
-        channel = self.get_channel(self.config.channels['ai_news'])
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#📝最新情報 channel not found or invalid.')
+        channel = self._text_channel('ai_news')
+        if channel is None:
             return
 
         articles = await self.fetch_ai_news()
@@ -382,12 +619,11 @@ class DejiRyuBot(commands.Bot):
                 title = article.get('title', 'タイトル未設定')
                 url = article.get('url')
                 summary = article.get('summary', '')
-                block = [f'- **{title}**']
+                lines.append(f'- **{title}**')
                 if summary:
-                    block.append(f'  {summary}')
+                    lines.append(f'  {summary}')
                 if url:
-                    block.append(f'  {url}')
-                lines.append('\n'.join(block))
+                    lines.append(f'  {url}')
             await channel.send('\n'.join(lines))
 
         await self.state.update('last_ai_news_push', today.isoformat())
@@ -395,64 +631,51 @@ class DejiRyuBot(commands.Bot):
     @ai_news_task.before_loop
     async def before_ai_news_task(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(7, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(7, 0)
 
     @tasks.loop(hours=168)
     async def interaction_report(self) -> None:
-        interaction_channel_id = self.config.channels.get('interaction')
-        if not interaction_channel_id:
-            return
-        channel = self.get_channel(interaction_channel_id)
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#交流会 channel not found or invalid.')
+        channel = self._text_channel('interaction')
+        if channel is None:
             return
 
         tz = self.config.tz
         now = datetime.now(tz)
         last_week = now - timedelta(days=7)
         week_key = iso_week_key(last_week)
-        counts: Dict[str, int] = self.state.get('reaction_counts', {}).get(week_key, {})
+        counts: Counter[str] = self._reaction_counts.get(week_key, Counter())
 
         if not counts:
             await channel.send('デジリューからの報告だ！先週はリアクションが少なめだったぞ。次はもっとワイワイしようぜ！🔥')
         else:
-            sorted_counts = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            top_counts = counts.most_common(10)
             lines = [
                 f'デジリューの交流会ランキング発表！ ({last_week:%m/%d}〜{now:%m/%d})',
                 'リアクション王は誰だ！？',
             ]
-            for idx, (user_id, count) in enumerate(sorted_counts[:10], start=1):
-                lines.append(f'{idx}. {mention_user(self, int(user_id))}：{count}リアクション')
+            for idx, (user_id, count) in enumerate(top_counts, start=1):
+                lines.append(f'{idx}. {self.mention_user(int(user_id))}：{count}リアクション')
             lines.append('今週もデジリューを驚かせるリアクション頼むぞ！🌟')
             await channel.send('\n'.join(lines))
 
-        async def mutate(counts_all: Optional[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
-            counts_all = counts_all or {}
-            counts_all.pop(week_key, None)
-            return counts_all
-
-        await self.state.mutate('reaction_counts', mutate)
+        if self._reaction_counts.pop(week_key, None) is not None:
+            self._reaction_counts_dirty = True
+        if prune_old_weeks(self._reaction_counts, now):
+            self._reaction_counts_dirty = True
+        await self._snapshot_reaction_counts()
 
     @interaction_report.before_loop
     async def before_interaction_report(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(10, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(10, 0)
 
     @tasks.loop(hours=24)
     async def exclusive_drop(self) -> None:
-        exclusive_channel_id = self.config.channels.get('exclusive')
-        if not exclusive_channel_id:
-            return
         if not self.config.exclusive_items:
             return
 
-        channel = self.get_channel(exclusive_channel_id)
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#限定コンテンツ channel not found or invalid.')
+        channel = self._text_channel('exclusive')
+        if channel is None:
             return
 
         now = datetime.now(self.config.tz)
@@ -481,15 +704,12 @@ class DejiRyuBot(commands.Bot):
     @exclusive_drop.before_loop
     async def before_exclusive_drop(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(21, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(21, 0)
 
     @tasks.loop(hours=168)
     async def achievement_report(self) -> None:
-        channel = self.get_channel(self.config.channels['achievements'])
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#できたを報告する部屋 channel not found or invalid.')
+        channel = self._text_channel('achievements')
+        if channel is None:
             return
 
         tz = self.config.tz
@@ -507,24 +727,29 @@ class DejiRyuBot(commands.Bot):
                 f'{last_week:%m/%d}〜{now:%m/%d}の「できた！」報告まとめだぞ💪',
                 'みんなの成長、デジリューがしっかり見届けた！',
             ]
-            for message_id in message_ids:
-                try:
-                    message = await channel.fetch_message(message_id)
-                except discord.NotFound:
+            semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+            fetched = await asyncio.gather(
+                *(self._safe_fetch(channel, message_id, semaphore) for message_id in message_ids)
+            )
+            # Resolve each author once even when they reported several times.
+            mentions: Dict[int, str] = {}
+            for message in fetched:
+                if message is None:
                     continue
-                author = message.author.mention
-                if guild:
-                    member = guild.get_member(message.author.id)
-                    if member:
-                        author = member.mention
+                author_id = message.author.id
+                if author_id not in mentions:
+                    member = guild.get_member(author_id) if guild else None
+                    mentions[author_id] = member.mention if member else message.author.mention
+                author = mentions[author_id]
                 excerpt = message.content[:120].replace('\n', ' ')
                 lines.append(f'- {author}：{excerpt}…')
             lines.append('次もド派手な「できた！」を待ってるぞ🔥')
             await channel.send('\n'.join(lines))
 
-        async def mutate(logs_all: Optional[Dict[str, List[int]]]) -> Dict[str, List[int]]:
+        def mutate(logs_all: Optional[Dict[str, List[int]]]) -> Dict[str, List[int]]:
             logs_all = logs_all or {}
             logs_all.pop(week_key, None)
+            prune_old_weeks(logs_all, now)
             return logs_all
 
         await self.state.mutate('achievement_logs', mutate)
@@ -532,76 +757,143 @@ class DejiRyuBot(commands.Bot):
     @achievement_report.before_loop
     async def before_achievement_report(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(20, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(20, 0)
 
     @tasks.loop(hours=120)
     async def consultation_ping(self) -> None:
-        channel = self.get_channel(self.config.channels['consultation'])
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#相談部屋 channel not found or invalid.')
+        channel = self._text_channel('consultation')
+        if channel is None:
             return
 
         prompt_cfg = self.config.consultation_prompt
-        message = random.choice(prompt_cfg.message_variations)
+        idx = self.state.get('consultation_msg_idx', 0)
+        message = prompt_cfg.shuffled[idx % len(prompt_cfg.shuffled)]
         ping = f'<@&{prompt_cfg.ping_role_id}>\n' if prompt_cfg.ping_role_id else ''
 
         await channel.send(
             f'{ping}デジリューからのおたずねタイム！\n{message}\n疑問が浮かんだ瞬間に投げてくれていいんだぞ。'
         )
+        await self.state.update('consultation_msg_idx', idx + 1)
         await self.state.update('last_consultation_ping', datetime.now(self.config.tz).isoformat())
 
     @consultation_ping.before_loop
     async def before_consultation_ping(self) -> None:
         await self.wait_until_ready()
-        target = next_run_at(12, 0, self.config.tz)
-        delay = max(0.0, (target - datetime.now(self.config.tz)).total_seconds())
-        await asyncio.sleep(delay)
+        await self._sleep_until_daily(12, 0)
 
     @tasks.loop(minutes=15)
     async def event_reminder(self) -> None:
-        channel_id = self.config.channels['events']
-        channel = self.get_channel(channel_id)
-        if not isinstance(channel, discord.TextChannel):
-            LOGGER.error('#イベント情報 channel not found or invalid.')
+        channel = self._text_channel('events')
+        if channel is None:
             return
 
-        tz = self.config.tz
-        now = datetime.now(tz)
-        events: List[Dict[str, Any]] = self.state.get('events', [])
-        updated_events: List[Dict[str, Any]] = []
+        now = datetime.now(self.config.tz)
+        events = self._parsed_events()
+        changed = False
 
-        for event in events:
-            event_time = datetime.fromisoformat(event['event_time']).astimezone(tz)
-            if event_time < now:
+        for message_id, event in list(events.items()):
+            if event.event_time < now:
+                del events[message_id]
+                changed = True
                 continue
 
-            reminders = [datetime.fromisoformat(ts).astimezone(tz) for ts in event.get('reminders', [])]
-            reminded = set(event.get('reminded', []))
-
-            for reminder_time in reminders:
-                key = reminder_time.isoformat()
-                if key in reminded:
+            for key, reminder_time in event.reminders:
+                if key in event.reminded:
                     continue
                 if reminder_time <= now:
                     await channel.send(
                         '《イベントリマインド》\n'
-                        f'「{event["title"]}」まであと {self._reminder_label(event_time, reminder_time)} だぞ！\n'
-                        f'開始日時：{event_time:%Y-%m-%d %H:%M}\n'
+                        f'「{event.payload["title"]}」まであと {self._reminder_label(event.event_time, reminder_time)} だぞ！\n'
+                        f'開始日時：{event.event_time:%Y-%m-%d %H:%M}\n'
                         '準備は整ってるか？デジリューはテンションMAXで待ってるぞ🔥'
                     )
-                    reminded.add(key)
-
-            event['reminded'] = list(reminded)
-            updated_events.append(event)
+                    event.reminded.add(key)
+                    event.payload['reminded'] = list(event.reminded)
+                    changed = True
 
-        await self.state.update('events', updated_events)
+        if changed:
+            await self.state.update('events', [event.payload for event in events.values()])
 
     @event_reminder.before_loop
     async def before_event_reminder(self) -> None:
         await self.wait_until_ready()
 
+    def _parsed_events(self) -> Dict[int, ParsedEvent]:
+        if self._event_cache is None:
+            self._event_cache = {}
+            for event in self.state.get('events', []):
+                self._event_cache[event['message_id']] = self._parse_event(event)
+        return self._event_cache
+
+    def _parse_event(self, event: Dict[str, Any]) -> ParsedEvent:
+        tz = self.config.tz
+        return ParsedEvent(
+            payload=event,
+            event_time=datetime.fromisoformat(event['event_time']).astimezone(tz),
+            reminders=[(ts, datetime.fromisoformat(ts).astimezone(tz)) for ts in event.get('reminders', [])],
+            reminded=set(event.get('reminded', [])),
+        )
+
+    @tasks.loop(seconds=30)
+    async def compact_state(self) -> None:
+        await self.state.compact()
+
+    @tasks.loop(minutes=2)
+    async def snapshot_reaction_counts(self) -> None:
+        await self._snapshot_reaction_counts()
+
+    async def _snapshot_reaction_counts(self) -> None:
+        if not self._reaction_counts_dirty:
+            return
+        self._reaction_counts_dirty = False
+        try:
+            await self.state.update(
+                'reaction_counts',
+                {week_key: dict(counts) for week_key, counts in self._reaction_counts.items()},
+            )
+        except asyncio.CancelledError:
+            self._reaction_counts_dirty = True
+            raise
+
+    async def _sleep_until_daily(self, hour: int, minute: int) -> None:
+        '''Sleep until the next wall-clock HH:MM in the configured timezone.'''
+        await discord.utils.sleep_until(next_run_at(hour, minute, self.config.tz))
+
+    def _text_channel(self, key: str) -> Optional[discord.TextChannel]:
+        '''
+        Resolve a configured channel to a TextChannel, caching hits.
+
+        Returns None without logging when an optional channel is not configured.
+        '''
+        cached = self._channel_cache.get(key)
+        if cached is not None:
+            return cached
+        channel_id = self.config.channels.get(key)
+        if not channel_id:
+            return None
+        channel = self.get_channel(channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            LOGGER.error('%s channel not found or invalid.', CHANNEL_LABELS.get(key, key))
+            return None
+        self._channel_cache[key] = channel
+        return channel
+
+    def mention_user(self, user_id: int) -> str:
+        user = self.get_user(user_id)
+        return user.mention if user else f'<@{user_id}>'
+
+    async def _safe_fetch(
+        self,
+        channel: discord.TextChannel,
+        message_id: int,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Message]:
+        async with semaphore:
+            try:
+                return await channel.fetch_message(message_id)
+            except discord.NotFound:
+                return None
+
     async def _collect_messages_between(
         self,
         channel: discord.TextChannel,
@@ -609,9 +901,19 @@ class DejiRyuBot(commands.Bot):
         end: datetime,
     ) -> List[Message]:
         messages: List[Message] = []
-        async for message in channel.history(limit=None, after=start, before=end, oldest_first=True):
+        # Page backwards from ``end`` in Discord's native order and stop at the
+        # first message older than ``start``. Passing ``after`` here would make
+        # discord.py keep paging past ``start`` and filter on the client side.
+        async for message in channel.history(
+            limit=self.MAX_DIGEST_MESSAGES,
+            before=end,
+            oldest_first=False,
+        ):
+            if message.created_at < start:
+                break
             if not message.author.bot:
                 messages.append(message)
+        messages.reverse()
         return messages
 
     def _reminder_label(self, event_time: datetime, reminder_time: datetime) -> str:
@@ -648,14 +950,22 @@ class DejiRyuBot(commands.Bot):
         url = 'https://newsapi.org/v2/everything'
         headers = {'X-Api-Key': api_key}
 
+        # Read the whole body inside the context on every path so the
+        # connection goes back to the pool instead of being left half-consumed.
         async with self.http_session.get(url, headers=headers, params=params) as resp:
+            body = await resp.read()
             if resp.status != 200:
-                LOGGER.error('News API request failed: %s - %s', resp.status, await resp.text())
+                LOGGER.error('News API request failed: %s - %s', resp.status, body.decode('utf-8', 'replace'))
                 return []
-            payload = await resp.json()
+
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            LOGGER.error('News API returned a body that is not valid JSON.')
+            return []
 
         articles = []
-        for article in payload.get('articles', []):
+        for article in payload.get('articles', [])[: self.config.ai_news_articles_per_day]:
             articles.append(
                 {
                     'title': article.get('title'),
@@ -681,7 +991,9 @@ async def main() -> None:
     config_path = Path(os.getenv('DEJIRYU_CONFIG_PATH', 'DEJIRYU_DISCORD/config.json'))
     state_path = Path(os.getenv('DEJIRYU_STATE_PATH', 'DEJIRYU_DISCORD/data/state.json'))
 
-    config = Config(load_json(config_path))
+    config_data = load_json(config_path)
+    validate_config(config_data)
+    config = Config(config_data)
     state = StateManager(state_path)
 
     token_env = config.discord_token_env
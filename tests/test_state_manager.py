@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+
+from dejiryu_bot import StateManager
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_torn_log_tail_is_truncated_before_new_appends(tmp_path: Path) -> None:
+    state_path = tmp_path / 'state.json'
+    wal_path = state_path.with_suffix('.log')
+    wal_path.write_bytes(b'{"k":"a","v":2}\n{"k":"a","v":')
+
+    async def restart_and_write() -> None:
+        state = StateManager(state_path)
+        assert state.get('a') == 2
+        assert wal_path.read_bytes() == b'{"k":"a","v":2}\n'
+        await state.update('c', 'new')
+        await state.flush_now()
+        # Simulate a second crash: drop the handle without compacting.
+        state._closing.set()
+        state._dirty.set()
+        await state._writer
+        state._wal.close()
+
+    async def reload() -> None:
+        state = StateManager(state_path)
+        assert state.get('a') == 2
+        assert state.get('c') == 'new'
+        await state.close()
+
+    _run(restart_and_write())
+    _run(reload())
+
+
+def test_log_with_only_a_torn_entry_is_emptied(tmp_path: Path) -> None:
+    state_path = tmp_path / 'state.json'
+    wal_path = state_path.with_suffix('.log')
+    wal_path.write_bytes(b'{"k":"a","v":1}')
+
+    async def restart() -> None:
+        state = StateManager(state_path)
+        assert state.get('a') is None
+        assert wal_path.read_bytes() == b''
+        await state.close()
+
+    _run(restart())
+
+
+def test_log_and_snapshot_accept_the_same_values(tmp_path: Path) -> None:
+    state_path = tmp_path / 'state.json'
+
+    async def write() -> None:
+        state = StateManager(state_path)
+        await state.update('counts', {1: 'one'})
+        await state.flush_now()
+        assert state_path.with_suffix('.log').read_bytes() == b'{"k":"counts","v":{"1":"one"}}\n'
+        await state.close()
+
+    async def reload() -> None:
+        state = StateManager(state_path)
+        assert state.get('counts') == {'1': 'one'}
+        await state.close()
+
+    _run(write())
+    _run(reload())